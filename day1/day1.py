@@ -4,9 +4,116 @@ Advent of code - day 1
 """
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import mmap
 import pathlib
 
 
+def iter_calories_per_elf(file, chunk_size=1 << 20):
+    """
+    Streams the calories per elf from a binary file, reading it in fixed-size chunks.
+    :param file: (io.BufferedReader) file opened in binary mode
+    :param chunk_size: (int) number of bytes to read at once, -1 reads the whole file
+    :return: (generator) yields the total calories of each elf
+    """
+    current_calories, has_items = 0, False
+    remainder = b''
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        calory_lines = (remainder + chunk).split(b'\n')
+        # the last line might be cut in half, keep it for the next chunk
+        remainder = calory_lines.pop()
+        for calory_line in calory_lines:
+            if calory_line.strip():
+                current_calories += int(calory_line)
+                has_items = True
+            elif has_items:  # repeated blank lines don't start new elves
+                yield current_calories
+                current_calories, has_items = 0, False
+
+    # the last elf is not necessarily followed by a blank line
+    if remainder.strip():
+        current_calories += int(remainder)
+        has_items = True
+    if has_items:
+        yield current_calories
+
+
+def get_top_k_calories(calories_per_elf, top_k):
+    """
+    Returns the k largest calorie totals, keeping a bounded min-heap of size k (O(n log k)).
+    :param calories_per_elf: (iterable) calories per elf
+    :param top_k: (int) number of largest totals to keep
+    :return: (list) the k largest totals, sorted in descending order
+    """
+    heap = []
+    for calories in calories_per_elf:
+        if len(heap) < top_k:
+            heapq.heappush(heap, calories)
+        elif calories > heap[0]:
+            heapq.heapreplace(heap, calories)
+    return sorted(heap, reverse=True)
+
+
+def get_chunk_boundaries(buffer, num_chunks):
+    """
+    Splits a buffer into roughly evenly sized chunks, cutting only at blank lines such that
+    no elf is split across two chunks.
+    :param buffer: (mmap.mmap, bytes) the raw file content
+    :param num_chunks: (int) desired number of chunks
+    :return: (list) list of (start, end) byte offsets
+    """
+    boundaries = [0]
+    for num_chunk in range(1, num_chunks):
+        offset = max(len(buffer) * num_chunk // num_chunks, boundaries[-1])
+        split = buffer.find(b'\n\n', offset)
+        if split == -1:
+            break
+        if split + 2 > boundaries[-1]:
+            boundaries.append(split + 2)
+    boundaries.append(len(buffer))
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def get_top_k_calories_in_chunk(input_path, start, end, top_k):
+    """
+    Computes the partial top-k of a single chunk. Intended to run inside a worker process.
+    :param input_path: (pathlib.Path) path to the input file
+    :param start: (int) start byte offset of the chunk
+    :param end: (int) end byte offset of the chunk
+    :param top_k: (int) number of largest totals to keep
+    :return: (list) the chunk's k largest totals
+    """
+    with open(input_path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        elves = buffer[start:end].split(b'\n\n')
+    return get_top_k_calories((sum(int(calories) for calories in elf.split())
+                               for elf in elves if elf.strip()), top_k=top_k)
+
+
+def get_top_k_calories_parallel(input_path, top_k, num_workers):
+    """
+    Computes the top-k calories with a process pool. The file is memory-mapped and cut at blank
+    lines, every worker computes a partial top-k and the partial results are merged.
+    :param input_path: (pathlib.Path) path to the input file
+    :param top_k: (int) number of largest totals to keep
+    :param num_workers: (int) number of worker processes
+    :return: (list) the k largest totals, sorted in descending order
+    """
+    with open(input_path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        chunks = get_chunk_boundaries(buffer, num_chunks=num_workers)
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        partial_top_k = executor.map(get_top_k_calories_in_chunk, *zip(*[
+            (input_path, start, end, top_k) for start, end in chunks]))
+        return get_top_k_calories((calories for partial in partial_top_k for calories in partial),
+                                  top_k=top_k)
+
+
 def day1():
     """
     Prints the results for the two day 1 riddles.
@@ -15,29 +122,30 @@ def day1():
     parser = argparse.ArgumentParser(description="Advent of code - day 1. Run "
                                                  "`python day1/day1.py` for the first part, and "
                                                  "`python day1/day1.py --top-k 3` "
-                                                 "for the second part.")
+                                                 "for the second part. Add `--streaming` to read "
+                                                 "the input in chunks with constant memory, or "
+                                                 "`--num-workers N` to use a process pool.")
     parser.add_argument('--top-k', type=int, default=1)
+    parser.add_argument('--streaming', default=False, action='store_true')
+    parser.add_argument('--num-workers', type=int, default=0)
     args = parser.parse_args()
     assert args.top_k > 0, f"`top-k` needs to be larger than 0, got {args.top_k}!"
+    assert args.num_workers >= 0, f"`num-workers` can't be negative, got {args.num_workers}!"
+
+    input_path = pathlib.Path(__file__).parent.resolve().joinpath('input.txt')
+
+    if args.num_workers > 0:
+        calories_per_elf = get_top_k_calories_parallel(input_path, top_k=args.top_k,
+                                                       num_workers=args.num_workers)
+        print(f"Maximum calories (k={args.top_k}): {sum(calories_per_elf)}")
+        return
 
-    # load the data
-    with open(pathlib.Path(__file__).parent.resolve().joinpath('input.txt'), 'r',
-              encoding='utf-8') as file:
-        calory_lines = file.readlines()
-
-    # sweep through the list and add the values per elf
-    calories_per_elf = []
-    current_calories = 0
-    for calory_line in calory_lines:
-        if calory_line != '\n':
-            current_calories += int(calory_line.strip())
-        else:
-            calories_per_elf.append(current_calories)
-            current_calories = 0
-
-    calories_per_elf = sorted(calories_per_elf, reverse=True)
-    print(f"Maximum calories (k={args.top_k}): "
-          f"{sum(calories_per_elf[:min(len(calories_per_elf), args.top_k)])}")
+    # without `--streaming`, the whole file is read at once
+    chunk_size = 1 << 20 if args.streaming else -1
+    with open(input_path, 'rb') as file:
+        calories_per_elf = get_top_k_calories(iter_calories_per_elf(file, chunk_size=chunk_size),
+                                              top_k=args.top_k)
+    print(f"Maximum calories (k={args.top_k}): {sum(calories_per_elf)}")
 
 
 if __name__ == '__main__':
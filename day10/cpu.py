@@ -0,0 +1,50 @@
+"""
+Advent of code - day 10, shared CPU engine
+(c) Wout Boerdijk
+"""
+
+import numpy as np
+
+
+def compile_program(program):
+    """
+    Compiles a program to the value of the X register during every cycle.
+    :param program: (bytes) raw program, one `noop` or `addx V` instruction per line
+    :return: (np.array) int64 array, entry i holds the X register during cycle i + 1
+    """
+    words = np.array(program.split())
+    is_instruction = (words == b'noop') | (words == b'addx')
+    is_addx = words[is_instruction] == b'addx'
+
+    # addx takes two cycles and changes the register after its second cycle
+    num_cycles = np.where(is_addx, 2, 1)
+    deltas = np.zeros(len(is_addx), dtype=np.int64)
+    deltas[is_addx] = words[~is_instruction].astype(np.int64)
+
+    x_before_instruction = 1 + np.concatenate(([0], np.cumsum(deltas)[:-1]))
+    return np.repeat(x_before_instruction, num_cycles)
+
+
+def get_signal_strength(x_register, cycles=range(20, 221, 40)):
+    """
+    Returns the total signal strength, i.e. the sum of cycle * X register for the given cycles.
+    :param x_register: (np.array) X register during every cycle
+    :param cycles: (iterable) 1-indexed cycles to evaluate
+    :return: (int) total signal strength
+    """
+    cycles = np.array(cycles, dtype=np.int64)
+    cycles = cycles[cycles <= len(x_register)]
+    return int((cycles * x_register[cycles - 1]).sum())
+
+
+def get_crt_bitmap(x_register, width=40):
+    """
+    Returns the CRT bitmap. A pixel is lit if the 3 pixel wide sprite, centered at the X
+    register, covers the currently drawn column. Incomplete rows are not drawn.
+    :param x_register: (np.array) X register during every cycle
+    :param width: (int) width of the CRT
+    :return: (np.array) 2d boolean array
+    """
+    num_pixels = len(x_register) // width * width
+    columns = np.arange(num_pixels) % width
+    return (np.abs(x_register[:num_pixels] - columns) <= 1).reshape(-1, width)
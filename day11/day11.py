@@ -4,6 +4,9 @@ Advent of code - day 11
 """
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
 from pathlib import Path
 import numpy as np
 
@@ -19,13 +22,33 @@ class MonkeyGame:
         """
         self.monkeys = monkeys
 
-    def play(self, num_rounds=1, decrease_worry_level=True):
+    def play(self, num_rounds=1, decrease_worry_level=True, mode='items', num_workers=None):
         """
         Plays the monkey game for num_rounds.
         :param num_rounds: (int) number of rounds to play
         :param decrease_worry_level: (bool) whether to decrease the worry level
+        :param mode: (str) one of 'items' (item by item), 'batched' (all items of a monkey at
+                     once, with worry levels reduced modulo the dividends' least common multiple)
+                     'cycles' (fast-forwards every item's cycle) or 'parallel' (like 'cycles', but
+                     with the items sharded across processes)
+        :param num_workers: (int, None) number of processes for the 'parallel' mode, defaults to
+                            the number of CPUs
         :return:
         """
+        if mode == 'batched':
+            self.play_batched(num_rounds=num_rounds, decrease_worry_level=decrease_worry_level)
+            return
+        if mode == 'cycles':
+            self.play_with_cycle_detection(num_rounds=num_rounds,
+                                           decrease_worry_level=decrease_worry_level)
+            return
+        if mode == 'parallel':
+            self.play_parallel(num_rounds=num_rounds, decrease_worry_level=decrease_worry_level,
+                               num_workers=num_workers)
+            return
+        if mode != 'items':
+            raise NotImplementedError(f"Unknown mode {mode}!")
+
         for _ in range(num_rounds):
             for _, monkey in enumerate(self.monkeys):
                 self.get_monkey_business()
@@ -33,6 +56,215 @@ class MonkeyGame:
                     item_with_worry_level, throw_to = monkey.examine_next_item(decrease_worry_level=decrease_worry_level)
                     self.monkeys[throw_to].items_with_worry_level.append(item_with_worry_level)
 
+    def get_worry_modulus(self):
+        """
+        Returns the least common multiple of all test dividends. Reducing the worry levels modulo
+        this value does not change the outcome of any test.
+        :return: (int) the worry modulus
+        """
+        return math.lcm(*[monkey.test_dividend for monkey in self.monkeys])
+
+    def get_items(self):
+        """
+        Returns the worry levels and positions of all items.
+        :return: (list, list) list of worry levels, and list of monkey indices holding the items
+        """
+        worry_levels, positions = [], []
+        for num_monkey, monkey in enumerate(self.monkeys):
+            worry_levels.extend(int(item.rest) for item in monkey.items_with_worry_level)
+            positions.extend([num_monkey] * len(monkey.items_with_worry_level))
+        return worry_levels, positions
+
+    def set_items(self, worry_levels, positions):
+        """
+        Hands the items back to the monkeys.
+        :param worry_levels: (iterable) worry levels of all items
+        :param positions: (iterable) monkey indices holding the items
+        :return:
+        """
+        dividends = [monkey.test_dividend for monkey in self.monkeys]
+        for monkey in self.monkeys:
+            monkey.items_with_worry_level = []
+        for worry_level, position in zip(worry_levels, positions):
+            self.monkeys[position].items_with_worry_level.append(
+                WorryLevelItem(int(worry_level), dividends=dividends))
+
+    def play_batched(self, num_rounds=1, decrease_worry_level=True):
+        """
+        Plays the monkey game for num_rounds, processing the whole queue of a monkey with a single
+        batched operation per turn and routing the items with boolean masks. Without decreasing
+        the worry level, worry levels are reduced modulo the dividends' least common multiple.
+        :param num_rounds: (int) number of rounds to play
+        :param decrease_worry_level: (bool) whether to decrease the worry level
+        :return:
+        """
+        worry_levels, positions = self.get_items()
+        modulus = self.get_worry_modulus()
+
+        # worry levels only stay bounded if they are reduced, and the largest intermediate value
+        # (a reduced worry level times, or plus, the largest operand) needs to fit into int64,
+        # otherwise use python ints
+        largest_operand = max([modulus - 1] + [monkey.operand for monkey in self.monkeys
+                                               if monkey.operand != 'old'])
+        if decrease_worry_level or modulus * largest_operand >= np.iinfo(np.int64).max:
+            worry_levels = np.array(worry_levels, dtype=object)
+        else:
+            worry_levels = np.array(worry_levels, dtype=np.int64) % modulus
+        positions = np.array(positions, dtype=np.int64)
+        num_inspections = np.zeros(len(self.monkeys), dtype=np.int64)
+
+        for _ in range(num_rounds):
+            for num_monkey, monkey in enumerate(self.monkeys):
+                holds_item = positions == num_monkey
+                if not holds_item.any():
+                    continue
+                items = monkey.operate(worry_levels[holds_item])
+                if decrease_worry_level:
+                    items //= 3
+                else:
+                    items %= modulus
+                worry_levels[holds_item] = items
+                positions[holds_item] = np.where(items % monkey.test_dividend == 0,
+                                                 monkey.throw_to_if_test_true,
+                                                 monkey.throw_to_if_test_false)
+                num_inspections[num_monkey] += len(items)
+
+        for monkey, monkey_inspections in zip(self.monkeys, num_inspections):
+            monkey.num_inspections += int(monkey_inspections)
+        self.set_items(worry_levels, positions)
+
+    def play_item_round(self, position, worry_level, modulus, decrease_worry_level, inspections):
+        """
+        Plays a single round for a single item. Items never interact, and an item thrown to a
+        monkey with a higher index is examined again within the same round.
+        :param position: (int) index of the monkey holding the item at the start of the round
+        :param worry_level: (int) worry level at the start of the round
+        :param modulus: (int) worry modulus, only used if the worry level is not decreased
+        :param decrease_worry_level: (bool) whether to decrease the worry level
+        :param inspections: (list) list to append the indices of the inspecting monkeys to
+        :return: (int, int) tuple of position and worry level at the start of the next round
+        """
+        while True:
+            monkey = self.monkeys[position]
+            inspections.append(position)
+            worry_level = monkey.operate(worry_level)
+            if decrease_worry_level:
+                worry_level //= 3
+            else:
+                worry_level %= modulus
+            throw_to = (monkey.throw_to_if_test_true if worry_level % monkey.test_dividend == 0
+                        else monkey.throw_to_if_test_false)
+            if throw_to < position:
+                return throw_to, worry_level
+            position = throw_to
+
+    def play_item(self, position, worry_level, num_rounds, decrease_worry_level=False):
+        """
+        Plays num_rounds for a single item. The item's path is a deterministic walk over the states
+        (position, worry level), so as soon as a state repeats, all remaining full cycles are
+        added up in closed form.
+        :param position: (int) index of the monkey holding the item
+        :param worry_level: (int) worry level of the item
+        :param num_rounds: (int) number of rounds to play
+        :param decrease_worry_level: (bool) whether to decrease the worry level
+        :return: (int, int, list) final position, final worry level, and list of inspections
+                 per monkey
+        """
+        modulus = self.get_worry_modulus()
+        if not decrease_worry_level:
+            worry_level %= modulus
+
+        visited, states, round_inspections = {}, [], []
+        state = (position, worry_level)
+        while len(states) < num_rounds and state not in visited:
+            visited[state] = len(states)
+            states.append(state)
+            round_inspections.append([])
+            state = self.play_item_round(*state, modulus=modulus,
+                                         decrease_worry_level=decrease_worry_level,
+                                         inspections=round_inspections[-1])
+
+        num_inspections = [0] * len(self.monkeys)
+        for inspections in round_inspections:
+            for num_monkey in inspections:
+                num_inspections[num_monkey] += 1
+        if len(states) == num_rounds:
+            return *state, num_inspections
+
+        # the state after all simulated rounds has been visited before, i.e. a cycle is found
+        cycle_start = visited[state]
+        num_cycles, remaining_rounds = divmod(num_rounds - len(states), len(states) - cycle_start)
+        cycle_inspections = [0] * len(self.monkeys)
+        for num_round, inspections in enumerate(round_inspections[cycle_start:]):
+            for num_monkey in inspections:
+                cycle_inspections[num_monkey] += num_cycles + (num_round < remaining_rounds)
+        num_inspections = [total + cycle for total, cycle in zip(num_inspections, cycle_inspections)]
+        return *states[cycle_start + remaining_rounds], num_inspections
+
+    def play_with_cycle_detection(self, num_rounds=1, decrease_worry_level=False):
+        """
+        Plays the monkey game for num_rounds, item by item with cycle detection. The costs per item
+        are bounded by its transient plus a single cycle, independent of num_rounds.
+        :param num_rounds: (int) number of rounds to play
+        :param decrease_worry_level: (bool) whether to decrease the worry level
+        :return:
+        """
+        worry_levels, positions = self.get_items()
+        for index, (worry_level, position) in enumerate(zip(worry_levels, positions)):
+            positions[index], worry_levels[index], num_inspections = self.play_item(
+                position, worry_level, num_rounds=num_rounds,
+                decrease_worry_level=decrease_worry_level)
+            for monkey, monkey_inspections in zip(self.monkeys, num_inspections):
+                monkey.num_inspections += monkey_inspections
+        self.set_items(worry_levels, positions)
+
+    def play_items(self, worry_levels, positions, num_rounds, decrease_worry_level=False):
+        """
+        Plays num_rounds for a shard of items.
+        :param worry_levels: (list) worry levels of the items
+        :param positions: (list) monkey indices holding the items
+        :param num_rounds: (int) number of rounds to play
+        :param decrease_worry_level: (bool) whether to decrease the worry level
+        :return: (list, list, list) final worry levels, final positions, and the summed
+                 inspections per monkey
+        """
+        final_worry_levels, final_positions = [], []
+        total_inspections = [0] * len(self.monkeys)
+        for worry_level, position in zip(worry_levels, positions):
+            position, worry_level, num_inspections = self.play_item(
+                position, worry_level, num_rounds=num_rounds,
+                decrease_worry_level=decrease_worry_level)
+            final_worry_levels.append(worry_level)
+            final_positions.append(position)
+            total_inspections = [total + item for total, item in zip(total_inspections,
+                                                                     num_inspections)]
+        return final_worry_levels, final_positions, total_inspections
+
+    def play_parallel(self, num_rounds=1, decrease_worry_level=False, num_workers=None):
+        """
+        Plays the monkey game for num_rounds, with the items sharded across a process pool. Items
+        never interact, so the inspections per monkey are simply summed over all shards.
+        :param num_rounds: (int) number of rounds to play
+        :param decrease_worry_level: (bool) whether to decrease the worry level
+        :param num_workers: (int, None) number of processes, defaults to the number of CPUs
+        :return:
+        """
+        worry_levels, positions = self.get_items()
+        num_shards = num_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=num_shards) as executor:
+            shards = [executor.submit(self.play_items, worry_levels[shard::num_shards],
+                                      positions[shard::num_shards], num_rounds,
+                                      decrease_worry_level)
+                      for shard in range(num_shards)]
+            results = [shard.result() for shard in shards]
+
+        for shard, (shard_worry_levels, shard_positions, num_inspections) in enumerate(results):
+            worry_levels[shard::num_shards] = shard_worry_levels
+            positions[shard::num_shards] = shard_positions
+            for monkey, monkey_inspections in zip(self.monkeys, num_inspections):
+                monkey.num_inspections += monkey_inspections
+        self.set_items(worry_levels, positions)
+
     def get_monkey_business(self):
         """
         Calculates the monkey business, i.e. multiplies the two highest monkey inspection values.
@@ -138,6 +370,17 @@ class Monkey:
         self.throw_to_if_test_false = throw_to_if_test_false
         self.num_inspections = 0
 
+    def operate(self, worry_levels):
+        """
+        Applies the monkey's operation to an array of worry levels.
+        :param worry_levels: (np.array) worry levels
+        :return: (np.array) new worry levels
+        """
+        operand = worry_levels if self.operand == 'old' else self.operand
+        if self.operator == '*':
+            return worry_levels * operand
+        return worry_levels + operand
+
     def examine_next_item(self, decrease_worry_level=True):
         """
         Examines the next item in the list.
@@ -180,18 +423,23 @@ def day11():
     parser = argparse.ArgumentParser(description="Advent of code - day 11. Run "
                                                  "`python day11/day11.py` for the first part, "
                                                  "and `python day11/day11.py --part-2` for the "
-                                                 "second part.")
+                                                 "second part. Use `--mode` to select the "
+                                                 "simulation engine.")
     parser.add_argument('--part-2', default=False, action='store_true')
+    parser.add_argument('--mode', default='items', choices=['items', 'batched', 'cycles', 'parallel'])
+    parser.add_argument('--num-rounds', type=int, default=None)
+    parser.add_argument('--num-workers', type=int, default=None)
     args = parser.parse_args()
 
     with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'r', encoding='utf-8') as file:
         lines = [line.strip() for line in file.readlines()]
 
     # parse lines to monkeys
+    dividends = [int(lines[monkey_line + 3].split(' ')[-1]) for monkey_line in range(0, len(lines), 7)]
     monkeys = []
     for monkey_line in range(0, len(lines), 7):
         items_with_worry_level = [int(starting_item) for starting_item in lines[monkey_line + 1].replace(',', '').split(' ')[2:]]
-        items_with_worry_level = [WorryLevelItem(item_with_worry_level) for item_with_worry_level in items_with_worry_level]
+        items_with_worry_level = [WorryLevelItem(item_with_worry_level, dividends=dividends) for item_with_worry_level in items_with_worry_level]
         operator, operand = lines[monkey_line + 2].split(' ')[-2:]
         test_dividend = int(lines[monkey_line + 3].split(' ')[-1])
         throw_to_if_test_true = int(lines[monkey_line + 4].split(' ')[-1])
@@ -201,8 +449,9 @@ def day11():
 
     # initialize a monkey game, and play
     monkey_game = MonkeyGame(monkeys=monkeys)
-    num_rounds = 10000 if args.part_2 else 20
-    monkey_game.play(num_rounds=num_rounds, decrease_worry_level=not args.part_2)
+    num_rounds = args.num_rounds if args.num_rounds is not None else (10000 if args.part_2 else 20)
+    monkey_game.play(num_rounds=num_rounds, decrease_worry_level=not args.part_2, mode=args.mode,
+                     num_workers=args.num_workers)
 
     print(f"Monkey business after {num_rounds} rounds: {monkey_game.get_monkey_business()}")
 
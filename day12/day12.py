@@ -4,7 +4,10 @@ Advent of code - day 12
 """
 
 import argparse
+from collections import deque
+import heapq
 from pathlib import Path
+import time
 import numpy as np
 
 
@@ -102,6 +105,209 @@ def get_valid_starting_positions(grid, part_2=False):
     return starting_positions
 
 
+def get_distances_to_end(grid):
+    """
+    Runs a single reverse breadth-first search from the end tile, using the inverted climbing
+    rule (one may step down at most one elevation level, but jump up arbitrarily).
+    :param grid: (np.array) 2d array representing the elevations, the end tile has elevation 27
+    :return: (np.array) 2d int array with the number of steps from every tile to the end, -1 if the
+             end is unreachable
+    """
+    distances = np.full(grid.shape, -1, dtype=np.int64)
+    queue = deque()
+    for end_i, end_j in zip(*np.where(grid == 27)):
+        distances[end_i, end_j] = 0
+        queue.append((int(end_i), int(end_j)))
+
+    elevations = grid.tolist()
+    steps = distances.tolist()
+    height, width = grid.shape
+    while queue:
+        i, j = queue.popleft()
+        for next_i, next_j in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if 0 <= next_i < height and 0 <= next_j < width and steps[next_i][next_j] == -1 and \
+                    elevations[i][j] - elevations[next_i][next_j] <= 1:
+                steps[next_i][next_j] = steps[i][j] + 1
+                queue.append((next_i, next_j))
+    distances[:] = steps
+    return distances
+
+
+def get_allowed_moves(grid, reverse=False):
+    """
+    Returns for every tile and each of the four directions whether a move is allowed, computed with
+    shifted-array comparisons of the elevations.
+    :param grid: (np.array) 2d array representing the elevations
+    :param reverse: (bool) whether to use the inverted climbing rule (for searching from the end)
+    :return: (list) list of (flat offset, flat boolean mask) tuples for up, down, left and right
+    """
+    height, width = grid.shape
+    grid = grid.astype(np.int16)
+    sign = -1 if reverse else 1
+    allowed_moves = []
+    for offset, neighbours, tiles in [(-width, np.s_[:-1, :], np.s_[1:, :]),
+                                      (width, np.s_[1:, :], np.s_[:-1, :]),
+                                      (-1, np.s_[:, :-1], np.s_[:, 1:]),
+                                      (1, np.s_[:, 1:], np.s_[:, :-1])]:
+        allowed = np.zeros((height, width), dtype=bool)
+        allowed[tiles] = sign * (grid[neighbours] - grid[tiles]) <= 1
+        allowed_moves.append((offset, allowed.ravel()))
+    return allowed_moves
+
+
+def get_distances_frontier(grid, reverse=True):
+    """
+    Iterative breadth-first search expanding the entire frontier per level at once. The frontier
+    is kept as an array of flat tile indices, which are filtered with the precomputed move masks
+    and the visited mask, so the costs per level only depend on the frontier size.
+    :param grid: (np.array) 2d array representing the elevations
+    :param reverse: (bool) whether to search from the end tile (elevation 27) with the inverted
+                    climbing rule, or from the start tile (elevation 0)
+    :return: (np.array) 2d int array with the number of steps between every tile and the end (or
+             the start), -1 if unreachable
+    """
+    allowed_moves = get_allowed_moves(grid, reverse=reverse)
+    distances = np.full(grid.size, -1, dtype=np.int32)
+    visited = np.zeros(grid.size, dtype=bool)
+
+    frontier = np.flatnonzero(grid == (27 if reverse else 0))
+    visited[frontier] = True
+    distances[frontier] = 0
+    level = 0
+    while frontier.size:
+        level += 1
+        candidates = np.concatenate([frontier[allowed[frontier]] + offset
+                                     for offset, allowed in allowed_moves])
+        frontier = np.unique(candidates[~visited[candidates]])
+        visited[frontier] = True
+        distances[frontier] = level
+    return distances.reshape(grid.shape)
+
+
+def iter_moves(elevations, i, j, reverse=False):
+    """
+    Yields all tiles reachable from a tile with a single step.
+    :param elevations: (list) 2d list representing the elevations
+    :param i: (int) ith location
+    :param j: (int) jth location
+    :param reverse: (bool) whether to use the inverted climbing rule
+    :return: (generator) yields (i, j) tuples
+    """
+    for next_i, next_j in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+        if 0 <= next_i < len(elevations) and 0 <= next_j < len(elevations[0]):
+            climb = elevations[next_i][next_j] - elevations[i][j]
+            if (-climb if reverse else climb) <= 1:
+                yield next_i, next_j
+
+
+def search_bfs(grid, start, end):
+    """
+    Plain breadth-first search between a single start and end tile.
+    :param grid: (np.array) 2d array representing the elevations
+    :param start: (tuple) (i, j) start tile
+    :param end: (tuple) (i, j) end tile
+    :return: (int, int) the number of steps (-1 if unreachable) and the number of expanded tiles
+    """
+    elevations = grid.tolist()
+    distances = {start: 0}
+    queue = deque([start])
+    num_expanded = 0
+    while queue:
+        tile = queue.popleft()
+        num_expanded += 1
+        if tile == end:
+            return distances[tile], num_expanded
+        for next_tile in iter_moves(elevations, *tile):
+            if next_tile not in distances:
+                distances[next_tile] = distances[tile] + 1
+                queue.append(next_tile)
+    return -1, num_expanded
+
+
+def search_astar(grid, start, end):
+    """
+    A* search between a single start and end tile, using a binary heap. The heuristic is the
+    maximum of the Manhattan distance and the elevation gap to the end, since every step moves by
+    one tile and climbs at most one elevation level. Both are consistent, hence admissible.
+    :param grid: (np.array) 2d array representing the elevations
+    :param start: (tuple) (i, j) start tile
+    :param end: (tuple) (i, j) end tile
+    :return: (int, int) the number of steps (-1 if unreachable) and the number of expanded tiles
+    """
+    elevations = grid.tolist()
+    end_elevation = elevations[end[0]][end[1]]
+
+    def heuristic(tile):
+        return max(abs(tile[0] - end[0]) + abs(tile[1] - end[1]),
+                   end_elevation - elevations[tile[0]][tile[1]])
+
+    distances = {start: 0}
+    heap = [(heuristic(start), 0, start)]
+    closed = set()
+    while heap:
+        _, distance, tile = heapq.heappop(heap)
+        if tile in closed:
+            continue
+        closed.add(tile)
+        if tile == end:
+            return distance, len(closed)
+        for next_tile in iter_moves(elevations, *tile):
+            if distance + 1 < distances.get(next_tile, distance + 2):
+                distances[next_tile] = distance + 1
+                heapq.heappush(heap, (distance + 1 + heuristic(next_tile), distance + 1,
+                                      next_tile))
+    return -1, len(closed)
+
+
+def search_bidirectional(grid, start, end):
+    """
+    Bidirectional breadth-first search between a single start and end tile. Always expands a full
+    level of the smaller frontier, forward from the start or reverse from the end, and stops at
+    the first level where both searches meet.
+    :param grid: (np.array) 2d array representing the elevations
+    :param start: (tuple) (i, j) start tile
+    :param end: (tuple) (i, j) end tile
+    :return: (int, int) the number of steps (-1 if unreachable) and the number of expanded tiles
+    """
+    if start == end:
+        return 0, 1
+    elevations = grid.tolist()
+    searches = [({start: 0}, [start], False), ({end: 0}, [end], True)]
+    num_expanded = 0
+    while searches[0][1] and searches[1][1]:
+        searches.sort(key=lambda search: len(search[1]))
+        distances, frontier, reverse = searches[0]
+        other_distances = searches[1][0]
+        next_frontier, path_lengths = [], []
+        for tile in frontier:
+            num_expanded += 1
+            for next_tile in iter_moves(elevations, *tile, reverse=reverse):
+                if next_tile in distances:
+                    continue
+                distances[next_tile] = distances[tile] + 1
+                next_frontier.append(next_tile)
+                if next_tile in other_distances:
+                    path_lengths.append(distances[next_tile] + other_distances[next_tile])
+        if path_lengths:
+            return min(path_lengths), num_expanded
+        searches[0] = (distances, next_frontier, reverse)
+    return -1, num_expanded
+
+
+def get_shortest_path_length(distances, grid, part_2=False):
+    """
+    Looks up the shortest path length in a distance map.
+    :param distances: (np.array) 2d int array with the number of steps to the end, -1 if
+                      unreachable
+    :param grid: (np.array) 2d array representing the elevations
+    :param part_2: (bool) whether to start from any tile with the lowest elevation
+    :return: (int) the number of steps of the shortest path, -1 if no start can reach the end
+    """
+    starts = grid <= 1 if part_2 else grid == 0
+    path_lengths = distances[starts & (distances >= 0)]
+    return int(path_lengths.min()) if path_lengths.size else -1
+
+
 def day12():
     """
     Prints the results for the two day 12 riddles.
@@ -110,8 +316,11 @@ def day12():
     parser = argparse.ArgumentParser(description="Advent of code - day 12. Run "
                                                  "`python day12/day12.py` for the first part, "
                                                  "and `python day12/day12.py --part-2` for the "
-                                                 "second part.")
+                                                 "second part. Use `--mode` to select the "
+                                                 "search engine.")
     parser.add_argument('--part-2', default=False, action='store_true')
+    parser.add_argument('--mode', default='levels', choices=['levels', 'reverse', 'frontier', 'bfs', 'astar',
+                                                       'bidirectional'])
     args = parser.parse_args()
 
     with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'r', encoding='utf-8') as file:
@@ -122,6 +331,34 @@ def day12():
     grid[grid == -13] = 0
     grid[grid == -27] = 27
 
+    if args.mode in ['bfs', 'astar', 'bidirectional']:
+        assert not args.part_2, f"Mode {args.mode} only supports single start/end queries!"
+        start = tuple(int(index) for index in np.argwhere(grid == 0)[0])
+        end = tuple(int(index) for index in np.argwhere(grid == 27)[0])
+        search = {'bfs': search_bfs, 'astar': search_astar,
+                  'bidirectional': search_bidirectional}[args.mode]
+        start_time = time.perf_counter()
+        path_length, num_expanded = search(grid, start, end)
+        if path_length == -1:
+            print("No path from the start to the end!")
+        else:
+            print(f"Number of steps for the shortest path: {path_length}")
+        print(f"Expanded tiles: {num_expanded}, wall time: {time.perf_counter() - start_time:.3f}s")
+        return
+
+    if args.mode in ['reverse', 'frontier']:
+        if args.part_2:
+            # the start tile counts as elevation `a` for the second part
+            grid[grid == 0] = 1
+        distances = get_distances_to_end(grid) if args.mode == 'reverse' else \
+            get_distances_frontier(grid, reverse=True)
+        path_length = get_shortest_path_length(distances, grid, part_2=args.part_2)
+        if path_length == -1:
+            print("No start tile can reach the end!")
+        else:
+            print(f"Number of steps for the shortest path: {path_length}")
+        return
+
     valid_starting_positions = get_valid_starting_positions(grid, part_2=args.part_2)
 
     path_lenghts = []
@@ -4,80 +4,256 @@ Advent of code - day 13
 """
 
 import argparse
+from bisect import bisect_right
+from functools import cmp_to_key
 from pathlib import Path
+import time
 
+# tokens of the flattened packet representation, all other tokens are non-negative ints
+OPEN_LIST = -1
+CLOSE_LIST = -2
 
-def to_list(item):
+WHITESPACE = b' \t\r\n'
+DIGITS = b'0123456789'
+PACKET_CHARACTERS = b'[],' + DIGITS
+
+
+def scan_packet(packet):
     """
-    Helper to convert an int to a list.
-    :param item: (any) the item to convert to a list, if it's an int
-    :return: (any) list if the item is an int, else the item
+    Scans a packet byte by byte in a single pass, without evaluating any code. Items need to be
+    separated by exactly one comma, i.e. packets like b'[1 2]', b'[,1]' or b'[1,]' are rejected.
+    :param packet: (bytes) a packet, e.g. b'[1,[2,3]]'
+    :return: (generator) yields `OPEN_LIST`, `CLOSE_LIST` and ints
     """
-    if isinstance(item, int):
-        return [item]
-    return item
+    depth = 0
+    expect_value = True  # at the start and after a comma, a value needs to follow
+    allow_close = False  # a list may be closed right after it was opened
+    index, length = 0, len(packet)
+    while index < length:
+        char = packet[index]
+        index += 1
+        if char in WHITESPACE:
+            continue
+        if char not in PACKET_CHARACTERS:
+            raise ValueError(f"Invalid character {chr(char)!r} in packet {packet[:100]}!")
 
+        if char == 93 and (allow_close or not expect_value):  # b']'
+            if depth == 0:
+                raise ValueError(f"Unbalanced brackets in packet {packet[:100]}!")
+            depth -= 1
+            expect_value, allow_close = False, False
+            yield CLOSE_LIST
+        elif not expect_value:
+            if depth == 0:
+                raise ValueError(f"Packet {packet[:100]} is not a single value!")
+            if char != 44:  # b','
+                raise ValueError(f"Missing comma in packet {packet[:100]}!")
+            expect_value = True
+        elif char == 91:  # b'['
+            depth += 1
+            allow_close = True
+            yield OPEN_LIST
+        elif char in DIGITS:
+            start = index - 1
+            while index < length and packet[index] in DIGITS:
+                index += 1
+            expect_value, allow_close = False, False
+            yield int(packet[start:index])
+        elif char == 44:  # b','
+            raise ValueError(f"Unexpected comma in packet {packet[:100]}!")
+        elif depth == 0:  # b']'
+            raise ValueError(f"Unbalanced brackets in packet {packet[:100]}!")
+        else:  # b']' after a comma
+            raise ValueError(f"Trailing comma in packet {packet[:100]}!")
 
-def compare_pairs(pair_a, pair_b):
+    if depth != 0:
+        raise ValueError(f"Unbalanced brackets in packet {packet[:100]}!")
+    if expect_value:
+        raise ValueError(f"Packet {packet[:100]} is empty!")
+
+
+def parse_packet(packet):
+    """
+    Parses a packet into nested lists in a single pass, without evaluating any code.
+    :param packet: (bytes) a packet, e.g. b'[1,[2,3]]'
+    :return: (list) the nested lists
+    """
+    stack = [[]]
+    for token in scan_packet(packet):
+        if token == OPEN_LIST:
+            sub_list = []
+            stack[-1].append(sub_list)
+            stack.append(sub_list)
+        elif token == CLOSE_LIST:
+            stack.pop()
+        else:
+            stack[-1].append(token)
+    return stack[0][0]
+
+
+def flatten_packet(packet):
+    """
+    Converts a packet into a flat token list of `OPEN_LIST`, `CLOSE_LIST` and ints, which can be
+    compared without building nested lists.
+    :param packet: (bytes) a packet, e.g. b'[1,[2,3]]'
+    :return: (list) list of int tokens
+    """
+    return list(scan_packet(packet))
+
+
+def benchmark_parsing(packets, num_packets=10**6):
+    """
+    Compares `eval` with `parse_packet` and `flatten_packet`, and prints the timings.
+    :param packets: (list) list of packets as bytes
+    :param num_packets: (int) number of packets to parse
+    :return:
+    """
+    packets = (packets * (num_packets // len(packets) + 1))[:num_packets]
+    decoded_packets = [packet.decode('utf-8') for packet in packets]
+
+    start_time = time.perf_counter()
+    evaluated = [eval(packet) for packet in decoded_packets]  # pylint: disable=eval-used
+    eval_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    parsed = [parse_packet(packet) for packet in packets]
+    parse_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for packet in packets:
+        flatten_packet(packet)
+    flatten_time = time.perf_counter() - start_time
+
+    assert evaluated == parsed
+    print(f"{num_packets} packets: eval {eval_time:.2f}s, parse_packet {parse_time:.2f}s, "
+          f"flatten_packet {flatten_time:.2f}s")
+
+
+def compare_packets(pair_a, pair_b):
     """
-    Recursively compares a packet pair according to the rules.
+    Compares a packet pair according to the rules. Uses an explicit stack instead of recursion,
+    so arbitrarily deep packets are supported. An int compared to a list is treated as a list
+    with a single item, without allocating a new list.
     :param pair_a: (list, int) a list or int
     :param pair_b: (list, int) a list or int
-    :return: (str) one of 'smaller', 'equal', 'larger'
+    :return: (int) -1 if pair_a is smaller, 0 if both are equal, 1 if pair_a is larger
     """
     if isinstance(pair_a, int) and isinstance(pair_b, int):
-        if pair_a == pair_b:
-            return 'equal'
-        if pair_a < pair_b:
-            return 'smaller'
-        return 'larger'
+        return (pair_a > pair_b) - (pair_a < pair_b)
+
+    # every frame holds two lists (or ints acting as single-item lists) and the current index
+    stack = [[pair_a, pair_b, 0]]
+    while stack:
+        frame = stack[-1]
+        list_a, list_b, index = frame
+        len_a = 1 if isinstance(list_a, int) else len(list_a)
+        len_b = 1 if isinstance(list_b, int) else len(list_b)
+        if index >= len_a or index >= len_b:
+            if len_a != len_b:
+                return (len_a > len_b) - (len_a < len_b)
+            stack.pop()
+            continue
+
+        frame[2] += 1
+        item_a = list_a if isinstance(list_a, int) else list_a[index]
+        item_b = list_b if isinstance(list_b, int) else list_b[index]
+        if isinstance(item_a, int) and isinstance(item_b, int):
+            if item_a != item_b:
+                return (item_a > item_b) - (item_a < item_b)
+        else:
+            stack.append([item_a, item_b, 0])
+    return 0
 
-    pair_a = to_list(pair_a)
-    pair_b = to_list(pair_b)
 
-    index = 0
-    for index, (item_a, item_b) in enumerate(zip(pair_a, pair_b)):
-        comparison = compare_pairs(item_a, item_b)
-        if comparison in ['smaller', 'larger']:
-            return comparison
+def compare_flattened_packets(tokens_a, tokens_b):
+    """
+    Compares two flattened packets (see `flatten_packet`) by walking both token streams in
+    lockstep. An int facing an opened list is virtually wrapped: the list token is skipped on the
+    other side and the matching closing token is emitted after the int.
+    :param tokens_a: (list) flattened tokens of the first packet
+    :param tokens_b: (list) flattened tokens of the second packet
+    :return: (int) -1 if the first packet is smaller, 0 if both are equal, 1 if it is larger
+    """
+    index_a, index_b = 0, 0
+    wraps_a, wraps_b = 0, 0  # virtual lists opened around the current int
+    closes_a, closes_b = 0, 0  # pending virtual closing tokens
+    while index_a < len(tokens_a) or closes_a:
+        token_a = CLOSE_LIST if closes_a else tokens_a[index_a]
+        token_b = CLOSE_LIST if closes_b else tokens_b[index_b]
 
-    # evaluate length
-    if len(pair_a[index:]) != len(pair_b[index:]):
-        if len(pair_a[index:]) < len(pair_b[index:]):
-            return 'smaller'
-        return 'larger'
-    return 'equal'
+        if token_a == token_b:
+            if closes_a:
+                closes_a -= 1
+            else:
+                index_a += 1
+                if token_a >= 0:
+                    closes_a, wraps_a = wraps_a, 0
+            if closes_b:
+                closes_b -= 1
+            else:
+                index_b += 1
+                if token_b >= 0:
+                    closes_b, wraps_b = wraps_b, 0
+        elif token_a == CLOSE_LIST:
+            return -1
+        elif token_b == CLOSE_LIST:
+            return 1
+        elif token_a >= 0 and token_b >= 0:
+            return (token_a > token_b) - (token_a < token_b)
+        elif token_a >= 0:  # the second packet opens a list
+            index_b += 1
+            wraps_a += 1
+        else:  # the first packet opens a list
+            index_a += 1
+            wraps_b += 1
+    return 0
+
+
+def compare_pairs(pair_a, pair_b):
+    """
+    Compares a packet pair according to the rules.
+    :param pair_a: (list, int) a list or int
+    :param pair_b: (list, int) a list or int
+    :return: (str) one of 'smaller', 'equal', 'larger'
+    """
+    return ('smaller', 'equal', 'larger')[compare_packets(pair_a, pair_b) + 1]
 
 
 def sort_packets(packets):
     """
-    Performs standard line sorting.
+    Sorts packets in O(n log n) comparisons. The sort is stable, i.e. equal packets keep their
+    order.
     :param packets: (list) list of packets
     :return: (list) sorted list of packets
     """
-    sorted_packets = []
-    while len(packets) != 0:
-        # search for smallest packet
-        smallest_packet = 0
-        for index in range(1, len(packets)):
-            is_smaller = compare_pairs(packets[smallest_packet], packets[index])
-            if is_smaller == 'larger':
-                smallest_packet = index
-        sorted_packets.append(packets.pop(smallest_packet))
-    return sorted_packets
+    return sorted(packets, key=cmp_to_key(compare_packets))
 
 
 def insert_packet_to_packets(packet, packets):
     """
-    Inserts a packet to a (sorted) list of packets.
+    Inserts a packet to a (sorted) list of packets, in place and with a binary search.
     :param packet: (list) list of ints
     :param packets: (list) list of packets
     :return: (list, int) tuple of updated list of packets, and the insertion index + 1
     """
-    for index in range(len(packets)):
-        if compare_pairs(packet, packets[index]) == 'smaller':
-            return packets[:index] + [packet] + packets[index:], index + 1
-    return packets, -1
+    packet_key = cmp_to_key(compare_packets)
+    index = bisect_right(packets, packet_key(packet), key=packet_key)
+    packets.insert(index, packet)
+    return packets, index + 1
+
+
+def get_divider_indices(packets, divider_packets=([[2]], [[6]])):
+    """
+    Returns the (1-based) indices the divider packets would have in the sorted list of all
+    packets, by counting the smaller or equal packets in O(n) instead of sorting. Packets equal
+    to a divider are counted before it, like the placement of `insert_packet_to_packets`.
+    :param packets: (list) list of packets, without the divider packets
+    :param divider_packets: (tuple) the divider packets, in ascending order
+    :return: (list) list of ints representing the divider packet indices
+    """
+    return [num_divider + 1 + sum(compare_packets(packet, divider_packet) <= 0
+                                  for packet in packets)
+            for num_divider, divider_packet in enumerate(divider_packets)]
 
 
 def day13():
@@ -88,37 +264,34 @@ def day13():
     parser = argparse.ArgumentParser(description="Advent of code - day 13. Run "
                                                  "`python day13/day13.py` for the first part, "
                                                  "and `python day13/day13.py --part-2` for the "
-                                                 "second part.")
+                                                 "second part. Run `--benchmark` to compare "
+                                                 "the packet parser with `eval`.")
     parser.add_argument('--part-2', default=False, action='store_true')
+    parser.add_argument('--benchmark', default=False, action='store_true')
+    parser.add_argument('--num-packets', type=int, default=10**6)
     args = parser.parse_args()
 
-    with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'r', encoding='utf-8') as file:
+    with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'rb') as file:
         packets = [packet.strip() for packet in file.readlines()]
 
-    packets = [packet for packet in packets if packet != '']
+    packets = [packet for packet in packets if packet != b'']
 
-    # parse packets to lists
-    if args.part_2:
-        packet_sets = [[eval(packet) for packet in packets]]
-    else:
-        packet_sets = []
-        for num_packet in range(0, len(packets), 2):
-            packet_sets.append([eval(packets[num_packet]), eval(packets[num_packet + 1])])
+    if args.benchmark:
+        benchmark_parsing(packets, num_packets=args.num_packets)
+        return
 
-    correctly_ordered_pairs = 0
-    for i, packet_set in enumerate(packet_sets):
-        sorted_packets = sort_packets(packet_set[:])
-        if sorted_packets == packet_set:
-            correctly_ordered_pairs += i+1
+    # parse packets to lists
+    packets = [parse_packet(packet) for packet in packets]
 
     if args.part_2:
-        sorted_packets_with_start_packet, start_divider_packet_index = insert_packet_to_packets(
-            packet=[[2]], packets=sorted_packets)
-        _, end_divider_packet_index = insert_packet_to_packets(packet=[[6]],
-                                                           packets=sorted_packets_with_start_packet)
+        start_divider_packet_index, end_divider_packet_index = get_divider_indices(packets)
         print(f"Multiplication of divider packet indices: "
               f"{start_divider_packet_index * end_divider_packet_index}")
     else:
+        correctly_ordered_pairs = 0
+        for i, num_packet in enumerate(range(0, len(packets), 2)):
+            if compare_packets(packets[num_packet], packets[num_packet + 1]) <= 0:
+                correctly_ordered_pairs += i+1
         print(f"Multiplication of correctly ordered pair indices: {correctly_ordered_pairs}")
 
 
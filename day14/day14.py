@@ -251,6 +251,110 @@ class Cave:
             return True
 
 
+class OccupancyCave:
+    """
+    Class representing a cave as a 2d occupancy grid (0: air, 1: rock, 2: sand), for simulating
+    falling sand with direct index checks.
+    """
+    AIR, ROCK, SAND = 0, 1, 2
+
+    def __init__(self, rock_coords, sand_origin_coords, with_ground_floor=False):
+        """
+        Initializes an occupancy cave instance.
+        :param rock_coords: (set) set of (i, j) rock coordinates
+        :param sand_origin_coords: (tuple) (i, j) sand origin coordinates
+        :param with_ground_floor: (bool) optionally adds an (infinitely wide) ground floor two
+                                  rows below the lowest rock, for the second part of the riddle
+        """
+        rock_coords_arr = np.array(list(rock_coords))
+        origin_i, origin_j = sand_origin_coords
+        max_i = max(int(rock_coords_arr[:, 0].max()), origin_i)
+        min_j = min(int(rock_coords_arr[:, 1].min()), origin_j)
+        max_j = max(int(rock_coords_arr[:, 1].max()), origin_j)
+
+        if with_ground_floor:
+            # sand piles up to a triangle, which can't get wider than the floor depth
+            max_i += 2
+            min_j = min(min_j, origin_j - max_i)
+            max_j = max(max_j, origin_j + max_i)
+
+        # one extra column on each side, sand reaching it falls into the abyss
+        self.min_j = min_j - 1
+        self.grid = np.zeros((max_i + 1, max_j - self.min_j + 2), dtype=np.uint8)
+        self.grid[rock_coords_arr[:, 0], rock_coords_arr[:, 1] - self.min_j] = self.ROCK
+        if with_ground_floor:
+            self.grid[-1] = self.ROCK
+
+        self.height, self.width = self.grid.shape
+        self.sand_origin = origin_i * self.width + origin_j - self.min_j
+        self.num_sand = 0
+
+        # falling path of the previous grain, from the sand origin downwards
+        self.path = [self.sand_origin]
+
+        # flat view for fast element access
+        self.cells = memoryview(self.grid).cast('B')
+
+    def pour_sand(self):
+        """
+        Pours one grain of sand and iteratively moves it until it rests or falls into the abyss.
+        :return: (bool) boolean indicating whether the grain came to rest
+        """
+        cells, width = self.cells, self.width
+        position = self.sand_origin
+        if cells[position] != self.AIR:
+            return False
+
+        last_row = (self.height - 1) * width
+        while True:
+            column = position % width
+            if position >= last_row or column == 0 or column == width - 1:
+                return False  # the abyss
+            below = position + width
+            if cells[below] == self.AIR:
+                position = below
+            elif cells[below - 1] == self.AIR:
+                position = below - 1
+            elif cells[below + 1] == self.AIR:
+                position = below + 1
+            else:
+                cells[position] = self.SAND
+                self.num_sand += 1
+                return True
+
+    def pour_sand_from_path(self):
+        """
+        Pours one grain of sand, starting at the last still-free cell of the previous grain's
+        falling path instead of the sand origin. The new grain would follow exactly the same path
+        until there, so the total work is roughly proportional to the number of filled cells.
+        :return: (bool) boolean indicating whether the grain came to rest
+        """
+        cells, width, path = self.cells, self.width, self.path
+        while path and cells[path[-1]] != self.AIR:
+            path.pop()
+        if not path:
+            return False
+
+        last_row = (self.height - 1) * width
+        position = path[-1]
+        while True:
+            column = position % width
+            if position >= last_row or column == 0 or column == width - 1:
+                return False  # the abyss
+            below = position + width
+            if cells[below] == self.AIR:
+                position = below
+            elif cells[below - 1] == self.AIR:
+                position = below - 1
+            elif cells[below + 1] == self.AIR:
+                position = below + 1
+            else:
+                cells[position] = self.SAND
+                self.num_sand += 1
+                return True
+            path.append(position)
+
+
 def day14():
     """
     Prints the results for the two day 14 riddles.
@@ -260,9 +364,12 @@ def day14():
                                                  "`python day14/day14.py` for the first part, "
                                                  "and `python day14/day14.py --part-2` for the "
                                                  "second part. Add `--viz` for an interactive "
-                                                 "visualization.")
+                                                 "visualization. Use `--mode grid` for the "
+                                                 "occupancy grid engine, or `--mode resume` to "
+                                                 "additionally resume the previous grain's path.")
     parser.add_argument('--part-2', default=False, action='store_true')
     parser.add_argument('--viz', default=False, action='store_true')
+    parser.add_argument('--mode', default='sets', choices=['sets', 'grid', 'resume'])
     args = parser.parse_args()
 
     with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'r', encoding='utf-8') as file:
@@ -278,6 +385,20 @@ def day14():
             rock_starts.append(rock_line[index])
             rock_ends.append(rock_line[index + 1])
 
+    if args.mode in ['grid', 'resume']:
+        cave = OccupancyCave(rock_coords=rock_coords, sand_origin_coords=(0, 500),
+                             with_ground_floor=args.part_2)
+        pour_sand = cave.pour_sand if args.mode == 'grid' else cave.pour_sand_from_path
+        while pour_sand():
+            pass
+
+        if args.viz:
+            cv2.imshow('cave grid', cave.grid * 127)
+            cv2.waitKey(0)
+
+        print(f"Resting sand units: {cave.num_sand}")
+        return
+
     # initialize a cave
     cave = Cave(rock_coords=rock_coords, sand_origin_coords={(0, 500)},
                 with_ground_floor=args.part_2)
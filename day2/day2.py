@@ -5,6 +5,7 @@ Advent of code - day 2
 
 import argparse
 from pathlib import Path
+import numpy as np
 
 
 def determine_outcome(move1: str, move2: str) -> int:
@@ -63,6 +64,44 @@ def outcome_to_move(move1: str, outcome: str) -> str:
     return chr(move2 + 23)
 
 
+def get_score_tables():
+    """
+    Builds 3x3 lookup tables with the points of a round, indexed by the opponent move (0: 'A',
+    1: 'B', 2: 'C') and the second column (0: 'X', 1: 'Y', 2: 'Z').
+    :return: (np.array, np.array) score tables for the first and the second part
+    """
+    scores_part_1 = np.zeros((3, 3), dtype=np.int64)
+    scores_part_2 = np.zeros((3, 3), dtype=np.int64)
+    for opponent_move in 'ABC':
+        for column in 'XYZ':
+            index = ord(opponent_move) - 65, ord(column) - 88
+            scores_part_1[index] = ord(column) - 87 + determine_outcome(move1=opponent_move,
+                                                                         move2=column)
+            your_move = outcome_to_move(opponent_move, column)
+            scores_part_2[index] = ord(your_move) - 87 + determine_outcome(move1=opponent_move,
+                                                                            move2=your_move)
+    return scores_part_1, scores_part_2
+
+
+def score_rounds(buffer):
+    """
+    Scores all rounds at once. Every line is expected to be of the form `A X\\n`, so the raw bytes
+    can be viewed as an array with a fixed stride of 4.
+    :param buffer: (bytes) raw content of the strategy guide
+    :return: (int, int) total points for the first and the second part
+    """
+    if not buffer.endswith(b'\n'):
+        buffer += b'\n'
+    rounds = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 4)
+
+    # count every (opponent move, second column) combination in a single pass
+    combinations = (rounds[:, 0].astype(np.intp) - 65) * 3 + rounds[:, 2] - 88
+    counts = np.bincount(combinations, minlength=9)
+
+    scores_part_1, scores_part_2 = get_score_tables()
+    return int(counts @ scores_part_1.ravel()), int(counts @ scores_part_2.ravel())
+
+
 def day2():
     """
     Prints the results for the two day 2 riddles.
@@ -71,10 +110,18 @@ def day2():
     parser = argparse.ArgumentParser(description="Advent of code - day 2. Run "
                                                  "`python day2/day2.py` for the first part, "
                                                  "and `python day2/day2.py --part-2` for the "
-                                                 "second part.")
+                                                 "second part. Add `--batch` to score all "
+                                                 "rounds at once.")
     parser.add_argument('--part-2',  default=False, action='store_true')
+    parser.add_argument('--batch', default=False, action='store_true')
     args = parser.parse_args()
 
+    if args.batch:
+        with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'rb') as file:
+            total_points = score_rounds(file.read())[1 if args.part_2 else 0]
+        print(f"Points earned: {total_points}")
+        return
+
     # load the data
     with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'r', encoding='utf-8') as file:
         rps_lines = file.readlines()
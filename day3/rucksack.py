@@ -0,0 +1,65 @@
+"""
+Advent of code - day 3, shared rucksack engine
+(c) Wout Boerdijk
+"""
+
+from itertools import islice
+import numpy as np
+
+# every item maps to a single bit of a 52-bit mask, the bit index + 1 is the item's priority
+ITEM_BITS = np.zeros(256, dtype=np.uint64)
+for item_bit, item in enumerate(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'):
+    ITEM_BITS[item] = 1 << item_bit
+
+
+def masks_to_priorities(masks):
+    """
+    Returns the priorities of masks with a single bit set each.
+    :param masks: (np.array) uint64 masks with exactly one bit set
+    :return: (np.array) the items' priorities
+    """
+    # for a power of two 2^k, frexp returns the exponent k + 1
+    return np.frexp(masks.astype(np.float64))[1]
+
+
+def get_compartment_masks(rucksack_lines):
+    """
+    Converts rucksacks to the item masks of their two compartments.
+    :param rucksack_lines: (list) list of stripped, non-empty byte strings
+    :return: (np.array, np.array) masks of the first and the second compartments
+    """
+    lengths = np.fromiter(map(len, rucksack_lines), dtype=np.int64, count=len(rucksack_lines))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    item_bits = ITEM_BITS[np.frombuffer(b''.join(rucksack_lines), dtype=np.uint8)]
+
+    # OR over [start, middle) and [middle, next start) of every rucksack
+    boundaries = np.stack((starts, starts + lengths // 2), axis=1).ravel()
+    compartment_masks = np.bitwise_or.reduceat(item_bits, boundaries)
+    return compartment_masks[0::2], compartment_masks[1::2]
+
+
+def get_rucksack_priorities(rucksack_lines, chunk_size=3 * 2**16):
+    """
+    Computes the results for both parts in a single streaming pass.
+    :param rucksack_lines: (iterable) lines of bytes, one rucksack each
+    :param chunk_size: (int) number of rucksacks processed at once, must be a multiple of 3
+    :return: (int, int) sum of the compartment priorities and sum of the badge priorities
+    """
+    assert chunk_size % 3 == 0, f"`chunk_size` needs to be a multiple of 3, got {chunk_size}!"
+    rucksack_lines = iter(rucksack_lines)
+    compartment_priorities, badge_priorities = 0, 0
+    while True:
+        chunk = [line.strip() for line in islice(rucksack_lines, chunk_size)]
+        chunk = [line for line in chunk if line]
+        if not chunk:
+            break
+        first_compartments, second_compartments = get_compartment_masks(chunk)
+        compartment_priorities += int(masks_to_priorities(
+            first_compartments & second_compartments).sum())
+
+        # the badge is the only item shared by all three rucksacks of a group
+        rucksack_masks = first_compartments | second_compartments
+        badge_masks = np.bitwise_and.reduce(rucksack_masks[:len(chunk) // 3 * 3].reshape(-1, 3),
+                                            axis=1)
+        badge_priorities += int(masks_to_priorities(badge_masks).sum())
+    return compartment_priorities, badge_priorities
@@ -5,6 +5,30 @@ Advent of code - day 4
 
 import argparse
 from pathlib import Path
+import numpy as np
+
+
+def load_section_assignments(buffer):
+    """
+    Parses all section assignments into an array of endpoints.
+    :param buffer: (bytes) raw content of the assignment list, one `a-b,c-d` pair per line
+    :return: (np.array) int64 array of shape (n, 4) holding start1, end1, start2, end2
+    """
+    endpoints = buffer.replace(b'-', b' ').replace(b',', b' ').split()
+    return np.array(endpoints, dtype=np.int64).reshape(-1, 4)
+
+
+def count_contained_and_overlapping(assignments):
+    """
+    Counts the pairs where one range fully contains the other, and the pairs that overlap at all.
+    Only the endpoints are compared, so the cost does not depend on the section widths.
+    :param assignments: (np.array) int64 array of shape (n, 4) holding start1, end1, start2, end2
+    :return: (int, int) number of fully contained pairs and number of overlapping pairs
+    """
+    start1, end1, start2, end2 = assignments.T
+    contained = ((start1 <= start2) & (end2 <= end1)) | ((start2 <= start1) & (end1 <= end2))
+    overlapping = (start1 <= end2) & (start2 <= end1)
+    return int(contained.sum()), int(overlapping.sum())
 
 
 def day4():
@@ -19,25 +43,11 @@ def day4():
     parser.add_argument('--part-2', default=False, action='store_true')
     args = parser.parse_args()
 
-    with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'r', encoding='utf-8') as file:
-        data_lines = file.readlines()
-
-    data_lines = [data_line.strip() for data_line in data_lines]
-
-    total_count = 0
-    for data_line in data_lines:
-        set1, set2 = data_line.split(',')
-        set1_start, set1_end = set1.split('-')
-        set2_start, set2_end = set2.split('-')
-        list1 = list(range(int(set1_start), int(set1_end) + 1))
-        list2 = list(range(int(set2_start), int(set2_end) + 1))
-
-        intersection = set(list1).intersection(list2)
+    with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'rb') as file:
+        assignments = load_section_assignments(file.read())
 
-        if args.part_2 and len(intersection) > 0:
-            total_count += 1
-        elif set(list1).issubset(intersection) or set(list2).issubset(intersection):
-            total_count += 1
+    num_contained, num_overlapping = count_contained_and_overlapping(assignments)
+    total_count = num_overlapping if args.part_2 else num_contained
 
     print(f"Total count: {total_count}")
 
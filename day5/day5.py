@@ -5,6 +5,8 @@ Advent of code - day 5
 
 import argparse
 from pathlib import Path
+import random
+import time
 
 
 def lines_to_stack(lines):
@@ -42,6 +44,141 @@ def lines_to_commandos(lines):
     return commandos
 
 
+class CrateStack:
+    """
+    Class representing a crate stack as a list of segments (rope-like), so that moving crates
+    does not depend on the stack height. Every segment references an immutable list of crates
+    by (start, end) and carries a lazy reversal flag.
+    """
+    def __init__(self, crates=()):
+        """
+        Initializes a crate stack.
+        :param crates: (iterable) crates from bottom to top
+        """
+        crates = list(crates)
+        self.segments = [(crates, 0, len(crates), False)] if crates else []
+
+    def take(self, howmany):
+        """
+        Removes the upper crates. Only the segment containing the cut is split.
+        :param howmany: (int) number of crates to take
+        :return: (list) taken segments from bottom to top
+        """
+        taken = []
+        while howmany > 0:
+            crates, start, end, is_reversed = self.segments.pop()
+            if end - start > howmany:
+                # split the segment, the top of a reversed segment is located at its start
+                if is_reversed:
+                    self.segments.append((crates, start + howmany, end, True))
+                    taken.append((crates, start, start + howmany, True))
+                else:
+                    self.segments.append((crates, start, end - howmany, False))
+                    taken.append((crates, end - howmany, end, False))
+                break
+            taken.append((crates, start, end, is_reversed))
+            howmany -= end - start
+        return taken[::-1]
+
+    def put(self, segments, reverse=False):
+        """
+        Puts segments on top of the stack.
+        :param segments: (list) segments from bottom to top
+        :param reverse: (bool) whether the crates are put one by one, i.e. in reversed order
+        :return:
+        """
+        if reverse:
+            segments = [(crates, start, end, not is_reversed) for
+                        (crates, start, end, is_reversed) in segments[::-1]]
+        self.segments.extend(segments)
+
+    def top(self):
+        """
+        Returns the upper crate.
+        :return: (str) the upper crate
+        """
+        crates, start, end, is_reversed = self.segments[-1]
+        return crates[start] if is_reversed else crates[end - 1]
+
+    def to_list(self):
+        """
+        Returns all crates.
+        :return: (list) crates from bottom to top
+        """
+        all_crates = []
+        for crates, start, end, is_reversed in self.segments:
+            all_crates.extend(crates[start:end][::-1] if is_reversed else crates[start:end])
+        return all_crates
+
+
+def move_crates(stack, commandos, part_2=False):
+    """
+    Executes all commandos on a stack given as a list of lists.
+    :param stack: (list) list of lists representing the stack
+    :param commandos: (list) list of lists representing the commands
+    :param part_2: (bool) whether multiple crates are moved at once
+    :return: (list) the updated stack
+    """
+    for (howmany, move_from, move_to) in commandos:
+        crates = stack[move_from][-howmany:]
+        if not part_2:
+            crates = crates[::-1]
+        stack[move_from] = stack[move_from][:-howmany]
+        stack[move_to].extend(crates)
+    return stack
+
+
+def move_crate_stacks(crate_stacks, commandos, part_2=False):
+    """
+    Executes all commandos on a list of CrateStack objects.
+    :param crate_stacks: (list) list of CrateStack objects
+    :param commandos: (list) list of lists representing the commands
+    :param part_2: (bool) whether multiple crates are moved at once
+    :return: (list) the updated crate stacks
+    """
+    for (howmany, move_from, move_to) in commandos:
+        crate_stacks[move_to].put(crate_stacks[move_from].take(howmany), reverse=not part_2)
+    return crate_stacks
+
+
+def benchmark(num_stacks=9, stack_height=10**5, num_commandos=10**6, max_howmany=50, seed=0):
+    """
+    Compares the list-based stacks and CrateStack on random commandos and prints the timings.
+    :param num_stacks: (int) number of stacks
+    :param stack_height: (int) initial height of every stack
+    :param num_commandos: (int) number of random commandos
+    :param max_howmany: (int) maximum number of crates moved by a single commando
+    :param seed: (int) random seed
+    :return:
+    """
+    rng = random.Random(seed)
+    stack = [[chr(65 + rng.randrange(26)) for _ in range(stack_height)]
+             for _ in range(num_stacks)]
+
+    commandos, heights = [], [stack_height] * num_stacks
+    for _ in range(num_commandos):
+        move_from = rng.choice([index for index, height in enumerate(heights) if height > 0])
+        move_to = rng.choice([index for index in range(num_stacks) if index != move_from])
+        howmany = rng.randint(1, min(max_howmany, heights[move_from]))
+        heights[move_from] -= howmany
+        heights[move_to] += howmany
+        commandos.append([howmany, move_from, move_to])
+
+    for part_2 in [False, True]:
+        start_time = time.perf_counter()
+        crate_stacks = move_crate_stacks([CrateStack(sub_stack) for sub_stack in stack], commandos,
+                                         part_2=part_2)
+        crate_stack_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        list_stacks = move_crates([sub_stack[:] for sub_stack in stack], commandos, part_2=part_2)
+        list_time = time.perf_counter() - start_time
+
+        assert [crate_stack.to_list() for crate_stack in crate_stacks] == list_stacks
+        print(f"{'Part 2' if part_2 else 'Part 1'}: lists {list_time:.2f}s, "
+              f"CrateStack {crate_stack_time:.2f}s")
+
+
 def day5():
     """
     Prints the results for the two day 2 riddles.
@@ -50,10 +187,20 @@ def day5():
     parser = argparse.ArgumentParser(description="Advent of code - day 5. Run "
                                                  "`python day5/day5.py` for the first part, "
                                                  "and `python day5/day5.py --part-2` for the "
-                                                 "second part.")
+                                                 "second part. Add `--crate-stacks` to use "
+                                                 "segment-based stacks, or run `--benchmark` "
+                                                 "to compare both.")
     parser.add_argument('--part-2', default=False, action='store_true')
+    parser.add_argument('--crate-stacks', default=False, action='store_true')
+    parser.add_argument('--benchmark', default=False, action='store_true')
+    parser.add_argument('--stack-height', type=int, default=10**5)
+    parser.add_argument('--num-commandos', type=int, default=10**6)
     args = parser.parse_args()
 
+    if args.benchmark:
+        benchmark(stack_height=args.stack_height, num_commandos=args.num_commandos)
+        return
+
     with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'r', encoding='utf-8') as file:
         data_lines = file.readlines()
 
@@ -65,14 +212,15 @@ def day5():
     commandos = lines_to_commandos(data_lines[split + 1:])
 
     # go through all commandos
-    for (howmany, move_from, move_to) in commandos:
-        crates = stack[move_from][-howmany:]
-        if not args.part_2:
-            crates = crates[::-1]
-        stack[move_from] = stack[move_from][:-howmany]
-        stack[move_to].extend(crates)
-
-    print(f"Final top crates: {''.join([sub_stack[-1] for sub_stack in stack])}")
+    if args.crate_stacks:
+        crate_stacks = move_crate_stacks([CrateStack(sub_stack) for sub_stack in stack], commandos,
+                                         part_2=args.part_2)
+        top_crates = [crate_stack.top() for crate_stack in crate_stacks]
+    else:
+        stack = move_crates(stack, commandos, part_2=args.part_2)
+        top_crates = [sub_stack[-1] for sub_stack in stack]
+
+    print(f"Final top crates: {''.join(top_crates)}")
 
 
 if __name__ == '__main__':
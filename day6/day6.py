@@ -5,6 +5,64 @@ Advent of code - day 6
 
 import argparse
 from pathlib import Path
+import sys
+
+
+def iter_chunks(file, chunk_size=1 << 16):
+    """
+    Reads a binary file in fixed-size chunks.
+    :param file: (io.BufferedReader) file opened in binary mode
+    :param chunk_size: (int) number of bytes to read at once
+    :return: (generator) yields chunks of bytes
+    """
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def find_markers(chunks, marker_lengths=(4, 14)):
+    """
+    Finds the end positions of the first windows with only distinct characters, in a single pass.
+    Keeps a rolling count of every character and the number of distinct characters per window,
+    so the cost is O(n) independent of the marker length.
+    :param chunks: (iterable) chunks of bytes of the data stream
+    :param marker_lengths: (iterable) marker lengths to look for
+    :return: (dict) marker length -> number of characters processed until the marker, or None if
+             the stream ended before
+    """
+    markers = {marker_length: None for marker_length in marker_lengths}
+    pending = sorted(markers)
+    counts = {marker_length: [0] * 256 for marker_length in pending}
+    num_distinct = {marker_length: 0 for marker_length in pending}
+    window = bytearray()
+    max_length = max(pending, default=0)
+
+    position = 0
+    for chunk in chunks:
+        for char in chunk.translate(None, b' \t\r\n'):
+            window.append(char)
+            position += 1
+            for marker_length in pending:
+                marker_counts = counts[marker_length]
+                marker_counts[char] += 1
+                if marker_counts[char] == 1:
+                    num_distinct[marker_length] += 1
+                if position > marker_length:
+                    dropped = window[-marker_length - 1]
+                    marker_counts[dropped] -= 1
+                    if marker_counts[dropped] == 0:
+                        num_distinct[marker_length] -= 1
+                if num_distinct[marker_length] == marker_length:
+                    markers[marker_length] = position
+            pending = [marker_length for marker_length in pending if markers[marker_length] is None]
+            if not pending:
+                return markers
+            # only the last `max_length` characters are needed
+            if len(window) > 2 * max_length:
+                del window[:-max_length - 1]
+    return markers
 
 
 def day6():
@@ -15,19 +73,29 @@ def day6():
     parser = argparse.ArgumentParser(description="Advent of code - day 6. Run "
                                                  "`python day6/day6.py` for the first part, "
                                                  "and `python day6/day6.py --part-2` for the "
-                                                 "second part.")
+                                                 "second part. Use `--marker-lengths` to look "
+                                                 "for several markers in a single pass, and "
+                                                 "`--stdin` to read the data stream from stdin.")
     parser.add_argument('--part-2', default=False, action='store_true')
+    parser.add_argument('--marker-lengths', type=int, nargs='+', default=None)
+    parser.add_argument('--stdin', default=False, action='store_true')
     args = parser.parse_args()
 
-    with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'r', encoding='utf-8') as file:
-        data_line = file.readlines()[0].strip()
+    marker_lengths = args.marker_lengths or [14 if args.part_2 else 4]
+    assert min(marker_lengths) > 0, f"Marker lengths need to be positive, got {marker_lengths}!"
 
-    marker_length = 14 if args.part_2 else 4
+    if args.stdin:
+        markers = find_markers(iter_chunks(sys.stdin.buffer), marker_lengths=marker_lengths)
+    else:
+        with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'rb') as file:
+            markers = find_markers(iter_chunks(file), marker_lengths=marker_lengths)
 
-    for i in range(len(data_line)):
-        if len(set(data_line[i:i+marker_length])) == marker_length:
-            print(f"Start-of-{'message' if args.part_2 else 'packet'}-marker: {i + marker_length}")
-            break
+    for marker_length in marker_lengths:
+        if args.marker_lengths is None:
+            print(f"Start-of-{'message' if args.part_2 else 'packet'}-marker: "
+                  f"{markers[marker_length]}")
+        else:
+            print(f"Marker (length {marker_length}): {markers[marker_length]}")
 
 
 if __name__ == '__main__':
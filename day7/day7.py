@@ -4,22 +4,66 @@ Advent of code - day 7
 """
 
 import argparse
+from bisect import bisect_left
+from itertools import accumulate
+import json
 from pathlib import Path
+import time
 
 
 def get_size_of_dirs(directory):
     """
-    Returns the size of all dirs below the given dir.
+    Returns the size of all dirs below the given dir. Every size is computed exactly once in an
+    iterative post-order pass, which also sets `size` of all visited directories.
     :param directory: (Dir) a directory
     :return: (list) list of ints representing the sizes
     """
     dir_sizes = []
-    for sub_dir in directory.dirs.values():
-        dir_sizes.append(sub_dir.calculate_size())
-        dir_sizes.extend(get_size_of_dirs(sub_dir))
+    stack = [(directory, False)]
+    while stack:
+        curr_dir, children_done = stack.pop()
+        if children_done:
+            curr_dir.size = sum(curr_dir.files.values()) + sum(
+                child_dir.size for child_dir in curr_dir.dirs.values())
+            if curr_dir is not directory:
+                dir_sizes.append(curr_dir.size)
+        else:
+            stack.append((curr_dir, True))
+            stack.extend((child_dir, False) for child_dir in curr_dir.dirs.values())
     return dir_sizes
 
 
+class DirectorySizeIndex:
+    """
+    Class representing a sorted index of directory sizes, answering threshold queries with
+    bisection.
+    """
+    def __init__(self, dir_sizes):
+        """
+        Initializes a directory size index.
+        :param dir_sizes: (iterable) ints representing the directory sizes
+        """
+        self.dir_sizes = sorted(dir_sizes)
+        self.cumulative_sizes = [0] + list(accumulate(self.dir_sizes))
+
+    def sum_below(self, threshold):
+        """
+        Returns the total size of all directories smaller than the threshold.
+        :param threshold: (int) exclusive upper bound
+        :return: (int) sum of the sizes
+        """
+        return self.cumulative_sizes[bisect_left(self.dir_sizes, threshold)]
+
+    def smallest_at_least(self, min_size):
+        """
+        Returns the size of the smallest directory that is at least `min_size` large.
+        :param min_size: (int) inclusive lower bound
+        :return: (int, None) the size, or None if no directory is large enough
+        """
+        index = bisect_left(self.dir_sizes, min_size)
+        return self.dir_sizes[index] if index < len(self.dir_sizes) else None
+
+
 class Directory:
     """
     Class representing a directory.
@@ -36,14 +80,11 @@ class Directory:
 
     def calculate_size(self):
         """
-        Recursively calculates the size for all sub-(sub-...)directories, if existing.
+        Calculates the size for all sub-(sub-...)directories, if existing.
         Sets `self.size`.
         :return: (int) total size of the directory including all sub-(sub-...)directories and files.
         """
-        dir_sizes = sum(size for size in [child_dir.calculate_size() for child_dir in
-                                          self.dirs.values()]
-                        if size is not None)
-        self.size = sum(self.files.values()) + dir_sizes
+        get_size_of_dirs(self)
         return self.size
 
     def get_root(self):
@@ -51,9 +92,154 @@ class Directory:
         Returns the up-most directory root.
         :return: (Dir) the directory's root.
         """
-        if self.parent:
-            return self.parent.get_root()
-        return self
+        root = self
+        while root.parent:
+            root = root.parent
+        return root
+
+
+class TerminalLogParser:
+    """
+    Class representing an incremental parser for (continuously appended) terminal logs.
+    Directory sizes are updated on every listed file, so both riddles can be answered at any
+    point in time. The parser remembers the byte offset of the last consumed line.
+    """
+    def __init__(self):
+        """
+        Initializes a terminal log parser with an empty root directory.
+        """
+        self.root = Directory(parent=None)
+        self.curr_dir = self.root
+        self.all_dirs = [self.root]
+        self.offset = 0
+
+    def parse_line(self, data_line):
+        """
+        Parses a single line and updates the sizes of all affected directories.
+        :param data_line: (str) a single stripped line
+        :return:
+        """
+        if data_line.startswith('$'):
+            if data_line[2:4] == 'cd':
+                key = data_line.split(' ')[-1]
+                if key == '/':
+                    self.curr_dir = self.root
+                elif key == '..':
+                    self.curr_dir = self.curr_dir.parent or self.root
+                else:
+                    self.curr_dir = self.add_dir(self.curr_dir, key)
+        elif data_line:  # lists a directory or a file
+            dir_or_size, name = data_line.split(' ')
+            if dir_or_size == 'dir':
+                self.add_dir(self.curr_dir, name)
+            else:
+                self.add_file(self.curr_dir, name, int(dir_or_size))
+
+    def add_dir(self, directory, name):
+        """
+        Adds a sub-directory, if not existing yet.
+        :param directory: (Directory) the parent directory
+        :param name: (str) name of the sub-directory
+        :return: (Directory) the sub-directory
+        """
+        if name not in directory.dirs:
+            directory.dirs[name] = Directory(parent=directory)
+            self.all_dirs.append(directory.dirs[name])
+        return directory.dirs[name]
+
+    def add_file(self, directory, name, size):
+        """
+        Adds (or updates) a file and propagates the size difference to all ancestors.
+        :param directory: (Directory) the directory containing the file
+        :param name: (str) name of the file
+        :param size: (int) size of the file
+        :return:
+        """
+        size_difference = size - directory.files.get(name, 0)
+        directory.files[name] = size
+        while directory is not None and size_difference:
+            directory.size += size_difference
+            directory = directory.parent
+
+    def consume(self, file, include_last_line=False):
+        """
+        Consumes all complete lines appended since the last call.
+        :param file: (io.BufferedReader) the log file opened in binary mode
+        :param include_last_line: (bool) whether to also consume a last line without a line
+                                  break, i.e. if the log is not being written anymore
+        :return: (int) number of consumed lines
+        """
+        file.seek(self.offset)
+        num_lines = 0
+        for data_line in file:
+            if not data_line.endswith(b'\n') and not include_last_line:  # still being written
+                break
+            self.offset += len(data_line)
+            self.parse_line(data_line.decode('utf-8').strip())
+            num_lines += 1
+        return num_lines
+
+    def get_sum_of_small_dirs(self, threshold=100000):
+        """
+        Returns the total size of all directories (except the root) smaller than the threshold.
+        :param threshold: (int) exclusive upper bound
+        :return: (int) sum of the sizes
+        """
+        return sum(directory.size for directory in self.all_dirs[1:] if directory.size < threshold)
+
+    def get_size_of_dir_to_delete(self, disk_space=70000000, required_space=30000000):
+        """
+        Returns the size of the smallest directory (except the root) freeing up enough space.
+        :param disk_space: (int) total disk space
+        :param required_space: (int) required unused space
+        :return: (int, None) the size, or None if no directory is large enough
+        """
+        min_space_to_delete = required_space - (disk_space - self.root.size)
+        return min((directory.size for directory in self.all_dirs[1:]
+                    if directory.size >= min_space_to_delete), default=None)
+
+    def save(self, state_path):
+        """
+        Saves the parser state, such that a restart resumes from the last consumed line.
+        :param state_path: (pathlib.Path) path of the state file
+        :return:
+        """
+        dir_paths = {self.root: []}
+        dirs, files = [], []
+        for directory in self.all_dirs:
+            for name, sub_dir in directory.dirs.items():
+                dir_paths[sub_dir] = dir_paths[directory] + [name]
+                dirs.append(dir_paths[sub_dir])
+            files.extend([dir_paths[directory], name, size]
+                         for name, size in directory.files.items())
+        with open(state_path, 'w', encoding='utf-8') as file:
+            json.dump({'offset': self.offset, 'curr_dir': dir_paths[self.curr_dir], 'dirs': dirs,
+                       'files': files}, file)
+
+    @classmethod
+    def load(cls, state_path):
+        """
+        Restores a parser from a state file.
+        :param state_path: (pathlib.Path) path of the state file
+        :return: (TerminalLogParser) the restored parser
+        """
+        with open(state_path, 'r', encoding='utf-8') as file:
+            state = json.load(file)
+
+        def get_dir(dir_path):
+            directory = log_parser.root
+            for name in dir_path:
+                directory = log_parser.add_dir(directory, name)
+            return directory
+
+        log_parser = cls()
+        for dir_path in state['dirs']:
+            get_dir(dir_path)
+        for dir_path, name, size in state['files']:
+            log_parser.add_file(get_dir(dir_path), name, size)
+        log_parser.curr_dir = get_dir(state['curr_dir'])
+        log_parser.offset = state['offset']
+        return log_parser
 
 
 def day7():
@@ -64,10 +250,38 @@ def day7():
     parser = argparse.ArgumentParser(description="Advent of code - day 7. Run "
                                                  "`python day7/day7.py` for the first part, "
                                                  "and `python day7/day7.py --part-2` for the "
-                                                 "second part.")
+                                                 "second part. Add `--stream` to parse the log "
+                                                 "incrementally (resuming from `--state-file`), "
+                                                 "and `--follow` to keep watching it.")
     parser.add_argument('--part-2', default=False, action='store_true')
+    parser.add_argument('--stream', default=False, action='store_true')
+    parser.add_argument('--follow', default=False, action='store_true')
+    parser.add_argument('--log-file', type=Path,
+                        default=Path(__file__).parent.resolve().joinpath('input.txt'))
+    parser.add_argument('--state-file', type=Path, default=None)
+    parser.add_argument('--poll-interval', type=float, default=1.0)
     args = parser.parse_args()
 
+    if args.stream or args.follow:
+        if args.state_file is not None and args.state_file.exists():
+            log_parser = TerminalLogParser.load(args.state_file)
+        else:
+            log_parser = TerminalLogParser()
+
+        with open(args.log_file, 'rb') as file:
+            while True:
+                if log_parser.consume(file, include_last_line=not args.follow) or not args.follow:
+                    if args.state_file is not None:
+                        log_parser.save(args.state_file)
+                    if args.part_2:
+                        print(f"Size of dir to delete: {log_parser.get_size_of_dir_to_delete()}")
+                    else:
+                        print(f"Total size (<100000): {log_parser.get_sum_of_small_dirs()}")
+                if not args.follow:
+                    break
+                time.sleep(args.poll_interval)
+        return
+
     with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'r', encoding='utf-8') as file:
         data_lines = [data_line.strip() for data_line in file.readlines()]
 
@@ -91,23 +305,18 @@ def day7():
             else:
                 curr_dir.files[name] = int(dir_or_size)
 
-    # go back to the parent, and recursively calculate the size for all directories
+    # go back to the parent, and calculate the size for all directories in a single pass
     parent = curr_dir.get_root()
-    total_size = parent.calculate_size()
-
-    # get the size of all dirs
-    dir_sizes = get_size_of_dirs(parent)
+    size_index = DirectorySizeIndex(get_size_of_dirs(parent))
+    total_size = parent.size
 
     if args.part_2:
         # select the one freeing up as much space as possible
-        # assumes all dirs have a different size
         min_space_to_delete = 30000000 - (70000000 - total_size)
-        dirs_above_min_space_required = sorted([dir_size for dir_size in dir_sizes
-                                                if dir_size >= min_space_to_delete])
-        print(f"Size of dir to delete: {dirs_above_min_space_required[0]}")
+        print(f"Size of dir to delete: {size_index.smallest_at_least(min_space_to_delete)}")
 
     else:
-        print(f"Total size (<100000): {sum(s for s in dir_sizes if s < 100000)}")
+        print(f"Total size (<100000): {size_index.sum_below(100000)}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,22 @@
+"""
+Advent of code - day 8
+(c) Wout Boerdijk
+"""
+
+from pathlib import Path
+from forest import load_trees, get_visible_mask, get_scenic_scores
+
+
+def day8():
+    """
+    Prints the results for the two day 8 riddles, loading the input only once.
+    :return:
+    """
+    trees = load_trees(Path(__file__).parent.resolve().joinpath('input.txt'))
+
+    print(f"Visible trees: {get_visible_mask(trees).sum()}")
+    print(f"Highest scenic score: {get_scenic_scores(trees).max()}")
+
+
+if __name__ == '__main__':
+    day8()
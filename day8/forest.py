@@ -0,0 +1,79 @@
+"""
+Advent of code - day 8, shared forest engine
+(c) Wout Boerdijk
+"""
+
+import numpy as np
+
+
+def load_trees(path):
+    """
+    Loads a forest of single-digit tree heights.
+    :param path: (pathlib.Path) path to the input file
+    :return: (np.array) 2d int8 array of tree heights
+    """
+    with open(path, 'rb') as file:
+        rows = file.read().split()
+    return (np.frombuffer(b''.join(rows), dtype=np.int8) - ord('0')).reshape(len(rows), -1)
+
+
+def get_directional_views(array):
+    """
+    Returns views of an array such that the four viewing directions (from left, right, top and
+    bottom) all point along the second axis.
+    :param array: (np.array) 2d array
+    :return: (list) list of four 2d views
+    """
+    return [array, array[:, ::-1], array.T, array[::-1].T]
+
+
+def get_visible_mask(trees):
+    """
+    Returns which trees are visible from outside the forest. A tree is visible from a direction if
+    it is larger than the cumulative maximum of all trees before it.
+    :param trees: (np.array) 2d array of tree heights
+    :return: (np.array) 2d boolean array
+    """
+    visible = np.ones(trees.shape, dtype=bool)
+    if min(trees.shape) < 3:
+        return visible
+    visible[1:-1, 1:-1] = False
+    for tree_view, visible_view in zip(get_directional_views(trees),
+                                       get_directional_views(visible)):
+        visible_view[:, 1:] |= tree_view[:, 1:] > np.maximum.accumulate(tree_view[:, :-1], axis=1)
+    return visible
+
+
+def get_viewing_distances(tree_lines):
+    """
+    Returns the viewing distance towards the start of every tree line, i.e. the number of trees
+    until the first tree of at least the same height (or the edge). Uses a monotonic stack per
+    tree line, so every tree is pushed and popped at most once.
+    :param tree_lines: (np.array) 2d array of tree heights, one tree line per row
+    :return: (np.array) 2d int64 array of viewing distances
+    """
+    viewing_distances = np.zeros(tree_lines.shape, dtype=np.int64)
+    for tree_line, line_distances in zip(tree_lines.tolist(), viewing_distances):
+        stack = []  # indices of trees with strictly decreasing heights
+        distances = []
+        for index, tree in enumerate(tree_line):
+            while stack and tree_line[stack[-1]] < tree:
+                stack.pop()
+            distances.append(index - stack[-1] if stack else index)
+            stack.append(index)
+        line_distances[:] = distances
+    return viewing_distances
+
+
+def get_scenic_scores(trees):
+    """
+    Returns the scenic score of every tree, i.e. the product of the viewing distances in all four
+    directions. Trees at the edge have a score of 0.
+    :param trees: (np.array) 2d array of tree heights
+    :return: (np.array) 2d int64 array of scenic scores
+    """
+    scenic_scores = np.ones(trees.shape, dtype=np.int64)
+    for tree_view, score_view in zip(get_directional_views(trees),
+                                     get_directional_views(scenic_scores)):
+        score_view *= get_viewing_distances(tree_view)
+    return scenic_scores
@@ -9,96 +9,106 @@ import numpy as np
 import cv2
 
 
-class Knot:
+DIRECTIONS = {'L': (-1, 0), 'R': (1, 0), 'U': (0, 1), 'D': (0, -1)}
+
+
+def pack_position(x_pos, y_pos):
     """
-    Class representing a knot.
+    Packs a position into a single 64-bit integer key, which is far more compact than a tuple.
+    :param x_pos: (int) x position, needs to fit into 32 bits
+    :param y_pos: (int) y position, needs to fit into 32 bits
+    :return: (int) the packed key
     """
-    def __init__(self, parent=None, child=None):
+    return (x_pos << 32) + y_pos
+
+
+class RunLengthTrajectory:
+    """
+    Class representing the trajectory of a knot as a run-length encoded log, i.e. a list of
+    [x, y, num_repetitions] entries.
+    """
+    def __init__(self):
         """
-        Initializes a knot.
-        :param parent: (Knot) optional parent knot
-        :param child: (Knot) optional child knot
+        Initializes an empty trajectory.
         """
-        self.parent = parent
-        self.child = child
-        self.x_pos = 0
-        self.y_pos = 0
-        self.prev_positions = [(self.x_pos, self.y_pos)]
+        self.runs = []
 
-    def move(self, direction=None):
+    def append(self, x_pos, y_pos):
         """
-        Moves into a certain direction. Also updates all children.
-        :param direction:
+        Appends a position.
+        :param x_pos: (int) x position
+        :param y_pos: (int) y position
         :return:
         """
-        if direction == 'L':
-            self.x_pos -= 1
-        elif direction == 'R':
-            self.x_pos += 1
-        elif direction == 'U':
-            self.y_pos += 1
-        elif direction == 'D':
-            self.y_pos -= 1
+        if self.runs and self.runs[-1][0] == x_pos and self.runs[-1][1] == y_pos:
+            self.runs[-1][2] += 1
         else:
-            parent_x_offset = self.parent.x_pos - self.x_pos
-            parent_y_offset = self.parent.y_pos - self.y_pos
-            if not (abs(parent_x_offset) <= 1 and abs(parent_y_offset) <= 1):
-                valid_spots_parent_view = get_connection_kernel(connectivity='4',
-                                                                x_offset=parent_x_offset,
-                                                                y_offset=parent_y_offset)
-                valid_spots_know_view = get_connection_kernel(connectivity='8')
-                intersection = valid_spots_parent_view.intersection(valid_spots_know_view)
-                if len(intersection) == 0:  # happens if the snake moves diagonally
-                    valid_spots_parent_view = get_connection_kernel(connectivity='8',
-                                                                    x_offset=parent_x_offset,
-                                                                    y_offset=parent_y_offset)
-                    intersection = valid_spots_parent_view.intersection(valid_spots_know_view)
-                assert len(intersection) == 1
-                x_pos, y_pos = list(intersection)[0]
-                self.x_pos += x_pos
-                self.y_pos += y_pos
-        self.prev_positions.append((self.x_pos, self.y_pos))
-
-        if self.child is not None:
-            self.child.move(direction=None)
-
-    def get_tail(self):
-        """
-        Returns the tail of a set of knots.
-        :return: (Knot) the tail
-        """
-        if self.child is not None:
-            return self.child.get_tail()
-        return self
+            self.runs.append([x_pos, y_pos, 1])
 
-    def get_prev_positions_recursively(self):
+    def decode(self):
         """
-        Returns all previous positions, including all positions of the child(ren).
-        :return: (list) list of lists
+        Returns the full trajectory.
+        :return: (list) list of (x, y) tuples
         """
-        all_prev_positions = [self.prev_positions]
-        if self.child is not None:
-            all_prev_positions += self.child.get_prev_positions_recursively()
-        return all_prev_positions
+        return [(x_pos, y_pos) for x_pos, y_pos, num_repetitions in self.runs
+                for _ in range(num_repetitions)]
 
 
-def get_connection_kernel(connectivity='4', x_offset=0, y_offset=0):
+def simulate_rope(movements, num_knots=2, trajectories=None):
     """
-    Returns a kernel representation, intended for matching for position retrieval.
-    :param connectivity: (str) 4-, 8- or 25- connectivity grid.
-    :param x_offset: (int) x offset applied to the kernel
-    :param y_offset: (int) y offset applied to the kernel
-    :return: (set) connectivity kernel
+    Simulates a rope with an arbitrary number of knots. All knot coordinates are kept in two flat
+    integer lists, every follower moves by the sign of its offset to the preceding knot, and the
+    propagation stops as soon as a knot does not move. Only the tail's unique positions are
+    tracked, as packed 64-bit keys.
+    :param movements: (list) list of (direction, num_steps) tuples
+    :param num_knots: (int) number of knots, including the head
+    :param trajectories: (list, None) optional empty list, gets filled with a RunLengthTrajectory
+                         per knot (including the starting position)
+    :return: (int) number of unique positions visited by the tail
     """
-    if connectivity == '4':
-        arr = np.array([0, 0, -1, 1])
-        stack = np.stack((arr + x_offset, arr[::-1] + y_offset), axis=1)
-        return {(stack_x, stack_y) for (stack_x, stack_y) in stack}
-    if connectivity == '8':
-        arr = np.array([-1, 0, 1]).repeat(3, axis=0).reshape(3, 3)
-        stack = np.stack((arr + x_offset, arr.T + y_offset), axis=-1).reshape(-1, 2)
-        return {(stack_x, stack_y) for (stack_x, stack_y) in stack}
-    raise NotImplementedError
+    x_pos, y_pos = [0] * num_knots, [0] * num_knots
+    tail_positions = set()
+    if trajectories is not None:
+        trajectories.extend(RunLengthTrajectory() for _ in range(num_knots))
+        for trajectory in trajectories:
+            trajectory.append(0, 0)
+    for direction, num_steps in movements:
+        x_step, y_step = DIRECTIONS[direction]
+        key_step = pack_position(x_step, y_step)
+        for num_step in range(1, num_steps + 1):
+            x_pos[0] += x_step
+            y_pos[0] += y_step
+            for knot in range(1, num_knots):
+                x_offset = x_pos[knot - 1] - x_pos[knot]
+                y_offset = y_pos[knot - 1] - y_pos[knot]
+                if -1 <= x_offset <= 1 and -1 <= y_offset <= 1:
+                    break
+                x_pos[knot] += (x_offset > 0) - (x_offset < 0)
+                y_pos[knot] += (y_offset > 0) - (y_offset < 0)
+            else:  # the tail has moved
+                tail_key = pack_position(x_pos[-1], y_pos[-1])
+                tail_positions.add(tail_key)
+                # once the rope is a straight line trailing the head, every remaining step of
+                # this movement shifts all knots by one step, and since the packing is linear,
+                # the tail's keys form an arithmetic sequence
+                num_remaining = num_steps - num_step
+                if num_remaining and trajectories is None and all(
+                        x_pos[knot - 1] - x_pos[knot] == x_step
+                        and y_pos[knot - 1] - y_pos[knot] == y_step
+                        for knot in range(1, num_knots)):
+                    for knot in range(num_knots):
+                        x_pos[knot] += num_remaining * x_step
+                        y_pos[knot] += num_remaining * y_step
+                    tail_positions.update(range(tail_key + key_step,
+                                                tail_key + (num_remaining + 1) * key_step,
+                                                key_step))
+                    break
+            if not tail_positions:  # the tail's position after the very first step
+                tail_positions.add(pack_position(x_pos[-1], y_pos[-1]))
+            if trajectories is not None:
+                for knot, trajectory in enumerate(trajectories):
+                    trajectory.append(x_pos[knot], y_pos[knot])
+    return len(tail_positions)
 
 
 def plot_knot(all_knot_indices):
@@ -108,23 +118,17 @@ def plot_knot(all_knot_indices):
     :return:
     """
     # shift indices to positive range first
-    head_indices = np.array(all_knot_indices[0])
-    tail_indices = np.array(all_knot_indices[0])
-
-    min_x, min_y = np.abs(head_indices.min(axis=0))
-    head_indices[:, 0] += min_x
-    head_indices[:, 1] += min_y
-    tail_indices[:, 0] += min_x
-    tail_indices[:, 1] += min_y
+    all_knot_indices = np.array(all_knot_indices)
+    all_knot_indices -= all_knot_indices.reshape(-1, 2).min(axis=0)
 
-    width, height = head_indices.max(axis=0) + 1
+    width, height = all_knot_indices.reshape(-1, 2).max(axis=0) + 1
 
     colors = 1 / np.arange(1, len(all_knot_indices) + 1)
 
     for num_steps in range(len(all_knot_indices[0])):
         plot = np.zeros((height * 5, width * 5))
-        for num_knot in enumerate(all_knot_indices):
-            x_pos, y_pos = all_knot_indices[num_knot][num_steps]
+        for num_knot, knot_indices in enumerate(all_knot_indices):
+            x_pos, y_pos = knot_indices[num_steps]
             plot[5*y_pos:5*y_pos+5, 5*x_pos:5*x_pos+5] = colors[num_knot]
         cv2.imshow('arr', np.flipud(plot))
         cv2.waitKey(0)
@@ -139,31 +143,29 @@ def day9():
                                                  "`python day9/day9.py` for the first part, "
                                                  "and `python day9/day9.py --part-2` for the "
                                                  "second part. Add `--viz` for an interactive "
-                                                 "visualization.")
+                                                 "visualization, or `--knots N` for a rope with "
+                                                 "N knots (including the head).")
     parser.add_argument('--part-2', default=False, action='store_true')
     parser.add_argument('--viz', default=False, action='store_true')
+    parser.add_argument('--knots', type=int, default=None)
     args = parser.parse_args()
 
+    num_knots = args.knots if args.knots is not None else (10 if args.part_2 else 2)
+    assert num_knots > 0, f"`knots` needs to be larger than 0, got {num_knots}!"
+
     with open(Path(__file__).parent.resolve().joinpath('input.txt'), 'r', encoding='utf-8') as file:
         movements = [line.strip().split(' ') for line in file.readlines()]
 
     movements = [(direction, int(num_steps)) for direction, num_steps in movements]
 
-    head = Knot()
-    num_childs = 9 if args.part_2 else 1
-    current_knot = head
-    for _ in range(num_childs):
-        current_knot.child = Knot(parent=current_knot)
-        current_knot = current_knot.child
-
-    for direction, num_steps in movements:
-        for _ in range(num_steps):
-            head.move(direction=direction)
+    # full trajectories are only recorded for the visualization
+    trajectories = [] if args.viz else None
+    num_unique_positions = simulate_rope(movements, num_knots=num_knots, trajectories=trajectories)
 
     if args.viz:
-        plot_knot(head.get_prev_positions_recursively())
+        plot_knot([trajectory.decode() for trajectory in trajectories])
 
-    print(f"Number of unique positions: {len(set(head.get_tail().prev_positions[1:]))}")
+    print(f"Number of unique positions: {num_unique_positions}")
 
 
 if __name__ == '__main__':